@@ -0,0 +1,130 @@
+# article_records.py
+# Shared article record types used by every scraper, so all sources produce the same columns
+from array import array # compact typed storage for the numeric score columns
+from dataclasses import dataclass
+
+# Text columns, in the order they appear in output files
+TEXT_COLUMNS = ("headline", "date", "url", "keyword", "sentiment", "summary", "source")
+
+# Numeric columns, stored as float64 arrays
+SCORE_COLUMNS = ("relevance_score", "climate_score", "location_score")
+
+ALL_COLUMNS = TEXT_COLUMNS + SCORE_COLUMNS
+
+
+@dataclass(slots=True)
+class ArticleRecord:
+    """A single scraped article - the same fields for every news source"""
+    headline: str
+    url: str
+    date: str = "Unknown"
+    keyword: str = ""
+    sentiment: str = "Neutral (0.0)"
+    summary: str = ""
+    source: str = ""
+    relevance_score: float = float("nan")
+    climate_score: float = float("nan")
+    location_score: float = float("nan")
+
+
+class ArticleBatch:
+    """Columnar builder that appends articles straight into per-column storage"""
+
+    __slots__ = ("_text", "_scores")
+
+    def __init__(self):
+        self._text = {name: [] for name in TEXT_COLUMNS}
+        self._scores = {name: array("d") for name in SCORE_COLUMNS}
+
+    def __len__(self):
+        return len(self._text["headline"])
+
+    def append(self, record):
+        """Append an ArticleRecord, splitting its fields into the columns"""
+        for name in TEXT_COLUMNS:
+            self._text[name].append(getattr(record, name))
+        for name in SCORE_COLUMNS:
+            self._scores[name].append(getattr(record, name))
+
+    def extend(self, records):
+        """Append every record from an iterable"""
+        for record in records:
+            self.append(record)
+
+    def column(self, name):
+        """Return the storage for a single column (list for text, array for scores)"""
+        if name in self._text:
+            return self._text[name]
+        return self._scores[name]
+
+    def record(self, index):
+        """Rebuild the ArticleRecord stored at a row index"""
+        fields = {name: self._text[name][index] for name in TEXT_COLUMNS}
+        fields.update({name: self._scores[name][index] for name in SCORE_COLUMNS})
+        return ArticleRecord(**fields)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.record(index)
+
+    def take(self, indices):
+        """Return a new batch containing only the given rows, in the given order"""
+        batch = ArticleBatch()
+        for name in TEXT_COLUMNS:
+            values = self._text[name]
+            batch._text[name] = [values[i] for i in indices]
+        for name in SCORE_COLUMNS:
+            values = self._scores[name]
+            batch._scores[name] = array("d", (values[i] for i in indices))
+        return batch
+
+    def unique_by(self, key):
+        """Keep the first row for each distinct key(row_index) value"""
+        seen = set()
+        keep = []
+        for index in range(len(self)):
+            value = key(index)
+            if value not in seen:
+                seen.add(value)
+                keep.append(index)
+        return self.take(keep)
+
+    def sorted_by(self, name, reverse=False):
+        """Return a new batch sorted on one column"""
+        values = self.column(name)
+        order = sorted(range(len(self)), key=values.__getitem__, reverse=reverse)
+        return self.take(order)
+
+    def to_dataframe(self, columns=ALL_COLUMNS):
+        """Convert to a pandas DataFrame without building per-row dicts"""
+        import numpy as np
+        import pandas as pd
+
+        data = {}
+        for name in columns:
+            if name in self._scores:
+                # One bulk copy of the typed buffer, so the batch can keep growing afterwards
+                data[name] = np.frombuffer(self._scores[name], dtype=np.float64).copy()
+            else:
+                data[name] = self._text[name]
+        return pd.DataFrame(data, columns=list(columns))
+
+    def to_arrow(self, columns=ALL_COLUMNS):
+        """Convert to a pyarrow Table (requires the optional pyarrow package)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for ArticleBatch.to_arrow(); install it with 'pip install pyarrow'")
+        import numpy as np
+
+        arrays = []
+        for name in columns:
+            if name in self._scores:
+                arrays.append(pa.array(np.frombuffer(self._scores[name], dtype=np.float64).copy()))
+            else:
+                arrays.append(pa.array(self._text[name], type=pa.string()))
+        return pa.Table.from_arrays(arrays, names=list(columns))
+
+    def to_csv(self, csv_filename, columns=ALL_COLUMNS):
+        """Write the batch to a CSV file"""
+        self.to_dataframe(columns).to_csv(csv_filename, index=False)
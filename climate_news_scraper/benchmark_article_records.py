@@ -0,0 +1,68 @@
+# benchmark_article_records.py
+# Compares peak memory of the old list-of-dicts path with the shared ArticleBatch path
+import sys
+import time
+import tracemalloc
+import pandas as pd
+from article_records import ArticleRecord, ArticleBatch
+
+CSV_COLUMNS = ("headline", "date", "url", "keyword", "sentiment", "relevance_score")
+
+
+def make_fields(i):
+    """Build synthetic article fields resembling the RSS scraper output"""
+    return {
+        'headline': f"Heavy rainfall lashes Mumbai and Konkan, article number {i}",
+        'date': f"2024-07-{i % 28 + 1:02d}",
+        'url': f"https://example.com/news/maharashtra/article-{i}.cms",
+        'keyword': "rainfall",
+        'sentiment': "Neutral (0.0)",
+        'relevance_score': float(i % 40) / 2
+    }
+
+
+def dict_path(n):
+    """Old approach: list of per-article dicts copied into a DataFrame"""
+    articles = [make_fields(i) for i in range(n)]
+    df = pd.DataFrame(articles)
+    return articles, df
+
+
+def record_list_path(n):
+    """List of __slots__ ArticleRecord objects converted through the batch builder"""
+    records = [ArticleRecord(**make_fields(i)) for i in range(n)]
+    batch = ArticleBatch()
+    batch.extend(records)
+    df = batch.to_dataframe(CSV_COLUMNS)
+    return records, df
+
+
+def batch_path(n):
+    """New approach: append directly into the columnar batch, then convert"""
+    batch = ArticleBatch()
+    for i in range(n):
+        batch.append(ArticleRecord(**make_fields(i)))
+    df = batch.to_dataframe(CSV_COLUMNS)
+    return batch, df
+
+
+def measure(label, func, n):
+    """Run func(n) under tracemalloc and print peak memory and elapsed time"""
+    tracemalloc.start()
+    start_time = time.time()
+    result = func(n)
+    elapsed_time = time.time() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{label:<28} peak {peak / (1024 * 1024):8.2f} MiB   time {elapsed_time:6.2f} s")
+    return peak
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"Peak memory for {n} articles:")
+    dict_peak = measure("list of dicts + DataFrame", dict_path, n)
+    measure("ArticleRecord list + batch", record_list_path, n)
+    batch_peak = measure("ArticleBatch + DataFrame", batch_path, n)
+    print(f"\nArticleBatch uses {batch_peak / dict_peak:.0%} of the list-of-dicts peak")
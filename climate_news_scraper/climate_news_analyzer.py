@@ -1,88 +1,144 @@
 # climate_news_analyzer.py
+import argparse
+import glob
 import pandas as pd
-import sys
 import time
+from climate_news_rollups import DailyRollups, IMPACT_CATEGORIES, extract_location
 
 class ClimateNewsAnalyzer:
-    def __init__(self, csv_file):
+    def __init__(self, csv_file, rollup_file="climate_news_daily_rollups.db"):
         self.csv_file = csv_file
+        self.data = self.load_csv(csv_file)
+
+        # Impact categories for analysis (simple version)
+        self.impact_categories = dict(IMPACT_CATEGORIES)
+
+        # Daily count tables kept up to date across runs
+        self.rollups = DailyRollups(rollup_file)
+
+    def load_csv(self, csv_file):
+        """Load a scraper CSV, falling back to an empty frame"""
         try:
-            self.data = pd.read_csv(csv_file)
-            print(f"Successfully loaded {len(self.data)} articles from {csv_file}")
+            data = pd.read_csv(csv_file)
+            print(f"Successfully loaded {len(data)} articles from {csv_file}")
+            return data
         except Exception as e:
             print(f"Error loading CSV file: {e}")
-            self.data = pd.DataFrame(columns=["headline", "url", "sentiment", "keyword"])
-        
-        # Impact categories for analysis (simple version)
-        self.impact_categories = {
-            "drought": "water scarcity",
-            "rainfall": "water resources", 
-            "flood": "disaster impact",
-            "heatwave": "health effects",
-            "monsoon": "agricultural impact"
-        }
-    
+            return pd.DataFrame(columns=["headline", "url", "sentiment", "keyword"])
+
+    def add_derived_columns(self, data):
+        """Add the impact category and sentiment label columns used by the summaries"""
+        if "keyword" not in data.columns:
+            data["keyword"] = ""
+        data["impact_category"] = data["keyword"].map(
+            lambda k: self.impact_categories.get(k, "general impact")
+        )
+
+        # Extract sentiment labels without scores
+        if "sentiment" not in data.columns:
+            data["sentiment"] = "Neutral (0.0)"
+        data["sentiment_label"] = data["sentiment"].str.split("(").str[0].str.strip()
+        return data
+
     def analyze_articles(self):
         """Analyze each article for climate impact categories"""
         if len(self.data) == 0:
             print("No articles to analyze")
             return self.data
-            
+
         # Add new column for impact category based on keyword
-        self.data["impact_category"] = self.data["keyword"].map(
-            lambda k: self.impact_categories.get(k, "general impact")
-        )
-        
+        self.add_derived_columns(self.data)
+
         output_file = f"analyzed_{self.csv_file}"
         self.data.to_csv(output_file, index=False)
-        
+
+        # Fold the new articles into the daily rollups
+        added = self.rollups.add_dataframe(self.data)
+        self.rollups.save()
+
         print(f"\nAnalysis complete. Results saved to {output_file}")
+        print(f"Added {added} new articles to daily rollups in {self.rollups.rollup_file}")
         return self.data
-    
-    def generate_summary(self):
-        """Generate summary statistics"""
-        if len(self.data) == 0:
+
+    def rebuild_rollups(self, csv_pattern="maharashtra_climate_news_*.csv"):
+        """Recount the daily rollups from every raw scraper CSV on disk"""
+        csv_files = sorted(glob.glob(csv_pattern))
+        frames = (self.add_derived_columns(self.load_csv(f)) for f in csv_files)
+        self.rollups.rebuild(frames)
+        self.rollups.save()
+        print(f"Rebuilt daily rollups from {len(csv_files)} CSV files")
+
+    def generate_summary(self, start_date=None, end_date=None, location=None):
+        """Generate summary statistics from the daily rollups"""
+        summary = self.rollups.summarize(start_date, end_date, location)
+        total_articles = summary["total_articles"]
+        if total_articles == 0:
             print("No data to summarize")
             return
-            
-        # Basic statistics
-        total_articles = len(self.data)
-        keyword_counts = self.data["keyword"].value_counts()
-        
-        # Extract sentiment labels without scores
-        self.data["sentiment_label"] = self.data["sentiment"].str.split("(").str[0].str.strip()
-        sentiment_counts = self.data["sentiment_label"].value_counts()
-        
+
         print("\n===== MAHARASHTRA CLIMATE NEWS SUMMARY =====")
+        if start_date or end_date:
+            print(f"Date range: {start_date or 'start'} to {end_date or 'latest'}")
+        else:
+            # The counts come from the rollups, so without a range they cover every analysed file
+            print("Date range: all analysed history")
+        if location:
+            print(f"Location: {location}")
         print(f"Total articles analyzed: {total_articles}")
-        
+
         print("\nKeyword Distribution:")
-        for keyword, count in keyword_counts.items():
+        for keyword, count in summary["keyword"].most_common():
             print(f"  - {keyword}: {count} articles")
-            
+
         print("\nSentiment Distribution:")
-        for sentiment, count in sentiment_counts.items():
+        for sentiment, count in summary["sentiment_label"].most_common():
             print(f"  - {sentiment}: {count} articles")
-        
-        if "impact_category" in self.data.columns:
-            impact_counts = self.data["impact_category"].value_counts()
-            print("\nImpact Categories:")
-            for impact, count in impact_counts.items():
-                print(f"  - {impact}: {count} articles")
-        
-        print("\nTop Headlines:")
-        for i, row in self.data.head(min(5, len(self.data))).iterrows():
-            print(f"  - {row['headline']}")
+
+        print("\nImpact Categories:")
+        for impact, count in summary["impact_category"].most_common():
+            print(f"  - {impact}: {count} articles")
+
+        print("\nLocation Distribution:")
+        for place, count in summary["location"].most_common():
+            print(f"  - {place}: {count} articles")
+
+        # Headlines come from the current file, filtered the same way as the rollup counts
+        headlines = self.data
+        if len(headlines) > 0 and (start_date or end_date):
+            dates = headlines["date"].astype(str).str[:10] if "date" in headlines.columns else None
+            if dates is None:
+                headlines = headlines.iloc[0:0]
+            else:
+                # Undated rows ("Unknown" or blank) are left out of ranged summaries, as in the rollups
+                in_range = dates.str.match(r"\d{4}-\d{2}-\d{2}")
+                if start_date:
+                    in_range &= dates >= start_date
+                if end_date:
+                    in_range &= dates <= end_date
+                headlines = headlines[in_range]
+        if len(headlines) > 0 and location:
+            headlines = headlines[headlines["headline"].map(extract_location) == location.lower()]
+
+        if len(headlines) > 0:
+            print(f"\nTop Headlines (from {self.csv_file}):")
+            for i, row in headlines.head(min(5, len(headlines))).iterrows():
+                print(f"  - {row['headline']}")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python climate_news_analyzer.py <csv_file>")
-        sys.exit(1)
-        
-    csv_file = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Analyze scraped Maharashtra climate news")
+    parser.add_argument("csv_file", help="CSV file written by one of the scrapers")
+    parser.add_argument("--from", dest="start_date", help="First day of the summary (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end_date", help="Last day of the summary (YYYY-MM-DD)")
+    parser.add_argument("--location", help="Only summarize articles about this location")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Recount the daily rollups from all maharashtra_climate_news_*.csv files first")
+    args = parser.parse_args()
+
     start_time = time.time()
-    analyzer = ClimateNewsAnalyzer(csv_file)
+    analyzer = ClimateNewsAnalyzer(args.csv_file)
+    if args.rebuild:
+        analyzer.rebuild_rollups()
     analyzer.analyze_articles()
-    analyzer.generate_summary()
+    analyzer.generate_summary(args.start_date, args.end_date, args.location)
     elapsed_time = time.time() - start_time
-    print(f"\nAnalysis completed in {elapsed_time:.2f} seconds")
\ No newline at end of file
+    print(f"\nAnalysis completed in {elapsed_time:.2f} seconds")
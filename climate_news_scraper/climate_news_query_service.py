@@ -0,0 +1,269 @@
+# climate_news_query_service.py
+# Local HTTP/JSON query service over scraped articles, backed by an in-memory inverted index
+import csv
+import glob
+import heapq
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from climate_news_rollups import IMPACT_CATEGORIES, extract_location
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return set(TOKEN_PATTERN.findall(str(text).lower()))
+
+
+def to_score(value):
+    """Parse a relevance score, treating blanks and junk as 0"""
+    try:
+        score = float(value)
+        return score if score == score else 0.0  # NaN check
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ArticleIndex:
+    def __init__(self):
+        # Article id -> stored article fields
+        self.articles = []
+        self.url_to_id = {}
+
+        # Posting lists: value -> set of article ids
+        self.tokens = {}
+        self.keywords = {}
+        self.locations = {}
+        self.impacts = {}
+        self.dates = {}
+        # Sorted list of known dates, so a date range only touches the days inside it
+        self.sorted_dates = []
+
+        # CSV file -> (size, mtime) when refresh() last indexed it
+        self.loaded_files = {}
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.articles)
+
+    def add_article(self, article):
+        """Index one article dict; returns False if its URL is already indexed"""
+        url = article.get("url") or article.get("headline", "")
+        headline = article.get("headline", "")
+        body = f"{article.get('summary', '') or ''} {article.get('body', '') or ''}"
+        keyword = (article.get("keyword", "") or "").lower()
+        date = str(article.get("date") or "Unknown")[:10]
+
+        stored = {
+            "headline": headline,
+            "url": url,
+            "date": date,
+            "keyword": keyword,
+            # Lowercased like the search() lookups, whether supplied by the caller or derived here
+            "location": str(article.get("location") or extract_location(f"{headline} {body}")).lower(),
+            "impact_category": str(article.get("impact_category")
+                                   or IMPACT_CATEGORIES.get(keyword, "general impact")).lower(),
+            "sentiment": article.get("sentiment", "") or "",
+            "relevance_score": to_score(article.get("relevance_score"))
+        }
+
+        with self.lock:
+            if url in self.url_to_id:
+                return False
+            article_id = len(self.articles)
+            self.articles.append(stored)
+            self.url_to_id[url] = article_id
+
+            for token in tokenize(f"{headline} {body}"):
+                self.tokens.setdefault(token, set()).add(article_id)
+            self.keywords.setdefault(stored["keyword"], set()).add(article_id)
+            self.locations.setdefault(stored["location"], set()).add(article_id)
+            self.impacts.setdefault(stored["impact_category"], set()).add(article_id)
+            if date not in self.dates:
+                self.dates[date] = set()
+                if date != "Unknown":
+                    self.sorted_dates.insert(bisect_left(self.sorted_dates, date), date)
+            self.dates[date].add(article_id)
+            return True
+
+    def add_csv(self, csv_file):
+        """Index every article from a scraper CSV; returns how many were new"""
+        with open(csv_file, "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+        # The scraper may still be writing - leave a partly written last row for the next refresh
+        if not text.endswith("\n"):
+            text = text[:text.rfind("\n") + 1]
+        added = 0
+        for row in csv.DictReader(io.StringIO(text)):
+            if self.add_article(row):
+                added += 1
+        return added
+
+    def refresh(self, csv_pattern="maharashtra_climate_news_*.csv"):
+        """Index scraper CSVs that appeared or grew since the last refresh"""
+        added = 0
+        for csv_file in sorted(glob.glob(csv_pattern)):
+            try:
+                stat = os.stat(csv_file)
+                version = (stat.st_size, stat.st_mtime_ns)
+                if self.loaded_files.get(csv_file) == version:
+                    continue
+                # A changed file is read again in full; rows indexed before are skipped by URL
+                added += self.add_csv(csv_file)
+                self.loaded_files[csv_file] = version
+            except Exception as e:
+                print(f"Error indexing {csv_file}: {e}")
+        return added
+
+    def search(self, query="", keyword=None, location=None, impact=None,
+               date_from=None, date_to=None, k=10):
+        """Return the top-k articles by relevance score matching every given filter"""
+        with self.lock:
+            candidates = []
+            for token in tokenize(query):
+                candidates.append(self.tokens.get(token, set()))
+            if keyword:
+                candidates.append(self.keywords.get(keyword.lower(), set()))
+            if location:
+                candidates.append(self.locations.get(location.lower(), set()))
+            if impact:
+                candidates.append(self.impacts.get(impact.lower(), set()))
+            if date_from or date_to:
+                lo = bisect_left(self.sorted_dates, date_from) if date_from else 0
+                hi = bisect_right(self.sorted_dates, date_to) if date_to else len(self.sorted_dates)
+                in_range = set()
+                for date in self.sorted_dates[lo:hi]:
+                    in_range |= self.dates[date]
+                candidates.append(in_range)
+
+            if candidates:
+                # Intersect starting from the shortest posting list
+                candidates.sort(key=len)
+                matches = set(candidates[0])
+                for postings in candidates[1:]:
+                    matches &= postings
+                    if not matches:
+                        break
+            else:
+                matches = range(len(self.articles))
+
+            articles = self.articles
+            top_ids = heapq.nlargest(k, matches, key=lambda i: articles[i]["relevance_score"])
+            return len(matches), [articles[i] for i in top_ids]
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients can reuse one connection for many queries
+    protocol_version = "HTTP/1.1"
+    # Close idle keep-alive connections so they do not pin a thread each
+    timeout = 30
+    # Set by run_service()
+    index = None
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(parsed.query).items()}
+
+        if parsed.path == "/health":
+            self.send_json(200, {"articles": len(self.index), "files": len(self.index.loaded_files)})
+            return
+
+        if parsed.path != "/search":
+            self.send_json(404, {"error": f"Unknown path {parsed.path}"})
+            return
+
+        try:
+            k = int(params.get("k", 10))
+        except ValueError:
+            self.send_json(400, {"error": "k must be an integer"})
+            return
+
+        start_time = time.perf_counter()
+        total, results = self.index.search(
+            query=params.get("q", ""),
+            keyword=params.get("keyword"),
+            location=params.get("location"),
+            impact=params.get("impact"),
+            date_from=params.get("from"),
+            date_to=params.get("to"),
+            k=k
+        )
+        took_ms = (time.perf_counter() - start_time) * 1000
+        self.send_json(200, {"total": total, "took_ms": round(took_ms, 3), "results": results})
+
+    def do_POST(self):
+        """Accept new articles from the scrapers as a JSON object or list"""
+        if urlparse(self.path).path != "/articles":
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"[]")
+        except Exception as e:
+            self.send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+
+        if isinstance(payload, dict):
+            payload = [payload]
+        if not isinstance(payload, list) or not all(isinstance(article, dict) for article in payload):
+            self.send_json(400, {"error": "Expected a JSON object or a list of JSON objects"})
+            return
+        added = sum(1 for article in payload if self.index.add_article(article))
+        self.send_json(200, {"added": added, "articles": len(self.index)})
+
+    def log_message(self, format, *args):
+        # Keep the terminal quiet under load
+        pass
+
+
+class QueryServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 overflows under a few dozen concurrent clients,
+    # and every dropped SYN costs the client a one-second retransmit
+    request_queue_size = 128
+
+
+def run_service(host="127.0.0.1", port=8765, csv_pattern="maharashtra_climate_news_*.csv", refresh_interval=30):
+    """Load existing CSVs, keep picking up new ones, and serve queries"""
+    index = ArticleIndex()
+    start_time = time.time()
+    added = index.refresh(csv_pattern)
+    print(f"Indexed {added} articles from {len(index.loaded_files)} CSV files in {time.time() - start_time:.2f} seconds")
+
+    def refresh_loop():
+        while True:
+            time.sleep(refresh_interval)
+            new_articles = index.refresh(csv_pattern)
+            if new_articles:
+                print(f"Indexed {new_articles} new articles ({len(index)} total)")
+
+    threading.Thread(target=refresh_loop, daemon=True).start()
+
+    QueryHandler.index = index
+    server = QueryServer((host, port), QueryHandler)
+    print(f"Serving climate news queries on http://{host}:{port}/search")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down query service")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    run_service(port=port)
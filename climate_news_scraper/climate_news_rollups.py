@@ -0,0 +1,145 @@
+# climate_news_rollups.py
+# Incrementally maintained daily count tables (date x keyword x location x impact x sentiment)
+import sqlite3
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+# Locations checked in order - the most specific names come before the state-wide ones
+ROLLUP_LOCATIONS = [
+    "mumbai", "pune", "nagpur", "nashik", "aurangabad", "solapur", "kolhapur", "thane",
+    "konkan", "vidarbha", "marathwada", "western maharashtra", "maharashtra"
+]
+
+# Impact category for each primary climate keyword (simple version)
+IMPACT_CATEGORIES = {
+    "drought": "water scarcity",
+    "rainfall": "water resources",
+    "flood": "disaster impact",
+    "heatwave": "health effects",
+    "monsoon": "agricultural impact"
+}
+
+ROLLUP_DIMENSIONS = ("keyword", "location", "impact_category", "sentiment_label")
+
+
+def extract_location(text):
+    """Return the most specific Maharashtra location mentioned in the text"""
+    text_lower = str(text).lower()
+    for location in ROLLUP_LOCATIONS:
+        if location in text_lower:
+            return location
+    return "unspecified"
+
+
+class DailyRollups:
+    def __init__(self, rollup_file="climate_news_daily_rollups.db"):
+        self.rollup_file = rollup_file
+        # date string -> Counter of (keyword, location, impact_category, sentiment_label) -> count
+        self.days = {}
+        # Sorted list of dated keys, so a date range lookup only touches the days inside it
+        self.sorted_dates = []
+        # (date, key) counts changed since the last save
+        self.changed = set()
+        # The counts and the URLs already counted (so re-analysing an overlapping CSV does not
+        # double count) share one SQLite file and are saved in one transaction, so a run that
+        # dies mid-save can neither lose counts nor count the same URL again
+        self.db = sqlite3.connect(rollup_file)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS seen_urls (url TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS daily_counts (
+                date TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                location TEXT NOT NULL,
+                impact_category TEXT NOT NULL,
+                sentiment_label TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (date, keyword, location, impact_category, sentiment_label)
+            );
+        """)
+        self.load()
+
+    def load(self):
+        """Load previously saved rollups, if any"""
+        try:
+            rows = self.db.execute("SELECT date, keyword, location, impact_category, sentiment_label, count "
+                                   "FROM daily_counts")
+            for date, keyword, location, impact, sentiment, count in rows:
+                self.days.setdefault(date, Counter())[(keyword, location, impact, sentiment)] = count
+            self.sorted_dates = sorted(d for d in self.days if d != "Unknown")
+        except Exception as e:
+            print(f"Error loading rollups from {self.rollup_file}: {e}")
+            self.days = {}
+            self.sorted_dates = []
+
+    def save(self):
+        """Commit the changed counts together with the URLs counted since the last save"""
+        self.db.executemany(
+            "INSERT INTO daily_counts (date, keyword, location, impact_category, sentiment_label, count) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (date, keyword, location, impact_category, sentiment_label) "
+            "DO UPDATE SET count = excluded.count",
+            [(date, *key, self.days[date][key]) for date, key in self.changed])
+        self.db.commit()
+        self.changed = set()
+
+    def add_article(self, date, url, headline, keyword, impact_category, sentiment_label):
+        """Count one article; returns False if this URL was already counted"""
+        cursor = self.db.execute("INSERT OR IGNORE INTO seen_urls (url) VALUES (?)", (str(url),))
+        if cursor.rowcount == 0:
+            return False
+
+        # Missing dates come through pandas as NaN rather than an empty string
+        date = date[:10] if isinstance(date, str) and date else "Unknown"
+        if date not in self.days:
+            self.days[date] = Counter()
+            if date != "Unknown":
+                self.sorted_dates.insert(bisect_left(self.sorted_dates, date), date)
+
+        key = (str(keyword), extract_location(headline), str(impact_category), str(sentiment_label))
+        self.days[date][key] += 1
+        self.changed.add((date, key))
+        return True
+
+    def add_dataframe(self, data):
+        """Count every new article in an analysed DataFrame; returns how many were added"""
+        added = 0
+        dates = data["date"] if "date" in data.columns else ["Unknown"] * len(data)
+        # Scrapers that record no URL are de-duplicated on the headline instead
+        urls = data["url"] if "url" in data.columns else data["headline"]
+        for date, url, headline, keyword, impact, sentiment in zip(
+                dates, urls, data["headline"], data["keyword"],
+                data["impact_category"], data["sentiment_label"]):
+            if self.add_article(date, url, headline, keyword, impact, sentiment):
+                added += 1
+        return added
+
+    def rebuild(self, frames):
+        """Throw away the current rollups and recount from raw analysed DataFrames"""
+        self.days = {}
+        self.sorted_dates = []
+        self.changed = set()
+        # Cleared in the same transaction save() commits the recount in
+        self.db.execute("DELETE FROM seen_urls")
+        self.db.execute("DELETE FROM daily_counts")
+        for data in frames:
+            self.add_dataframe(data)
+
+    def summarize(self, start_date=None, end_date=None, location=None):
+        """Return Counters per dimension over a date range (inclusive, 'YYYY-MM-DD')"""
+        if start_date is None and end_date is None:
+            dates = list(self.days)
+        else:
+            lo = bisect_left(self.sorted_dates, start_date) if start_date else 0
+            hi = bisect_right(self.sorted_dates, end_date) if end_date else len(self.sorted_dates)
+            dates = self.sorted_dates[lo:hi]
+
+        totals = {dimension: Counter() for dimension in ROLLUP_DIMENSIONS}
+        total_articles = 0
+        for date in dates:
+            for key, count in self.days[date].items():
+                if location and key[1] != location.lower():
+                    continue
+                total_articles += count
+                for dimension, value in zip(ROLLUP_DIMENSIONS, key):
+                    totals[dimension][value] += count
+        totals["total_articles"] = total_articles
+        return totals
@@ -5,8 +5,8 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
-import pandas as pd
 import traceback
+from article_records import ArticleRecord, ArticleBatch
 
 class MaharashtraClimateNewsScraper:
     def __init__(self):
@@ -19,14 +19,18 @@ class MaharashtraClimateNewsScraper:
         self.chrome_options.add_argument("--window-size=1920,1080")
         self.chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36")
         
-        # Simple queries focused on Maharashtra weather events
-        self.queries = [
-            "Maharashtra flood",
-            "Maharashtra drought",
-            "Maharashtra monsoon",
-            "Maharashtra rainfall",
-            "Maharashtra heatwave"
-        ]
+        # Simple queries focused on Maharashtra weather events, each mapped to the climate
+        # keyword stored with its results (climate_news_analyzer.py maps keywords to impacts)
+        self.queries = {
+            "Maharashtra flood": "flood",
+            "Maharashtra drought": "drought",
+            "Maharashtra monsoon": "monsoon",
+            "Maharashtra rainfall": "rainfall",
+            "Maharashtra heatwave": "heatwave"
+        }
+        
+        # Columns written to the results CSV
+        self.csv_columns = ("headline", "url", "keyword")
     
     def setup_driver(self):
         """Initialize and return a Chrome WebDriver"""
@@ -34,9 +38,9 @@ class MaharashtraClimateNewsScraper:
     
     def scrape_news(self, driver):
         """Scrape news using direct Google search instead of Google News"""
-        all_articles = []
+        all_articles = ArticleBatch()
         
-        for query in self.queries:
+        for query, keyword in self.queries.items():
             # Use regular Google search instead of Google News
             url = f"https://www.google.com/search?q={query}+news&tbm=nws"
             print(f"Searching for: {query}")
@@ -60,10 +64,11 @@ class MaharashtraClimateNewsScraper:
                         link = link_element.get_attribute("href")
                         
                         if headline and link:
-                            all_articles.append({
-                                "Headline": headline,
-                                "Link": link
-                            })
+                            all_articles.append(ArticleRecord(
+                                headline=headline,
+                                url=link,
+                                keyword=keyword
+                            ))
                             print(f"Added: {headline[:40]}...")
                     except Exception as e:
                         print(f"Error extracting article details: {str(e)}")
@@ -86,17 +91,12 @@ class MaharashtraClimateNewsScraper:
             all_articles = self.scrape_news(driver)
             
             # Remove duplicates based on links
-            unique_links = set()
-            unique_articles = []
-            
-            for article in all_articles:
-                if article["Link"] not in unique_links:
-                    unique_links.add(article["Link"])
-                    unique_articles.append(article)
+            links = all_articles.column("url")
+            unique_articles = all_articles.unique_by(lambda i: links[i])
             
             # Convert to DataFrame and save as CSV
             if unique_articles:
-                df = pd.DataFrame(unique_articles)
+                df = unique_articles.to_dataframe(self.csv_columns)
                 csv_filename = f"maharashtra_climate_news_{time.strftime('%Y%m%d-%H%M%S')}.csv"
                 df.to_csv(csv_filename, index=False)
                 print(f"\nSaved {len(unique_articles)} unique articles to {csv_filename}")
@@ -0,0 +1,215 @@
+# distributed_scraper.py
+# Coordinator/worker mode: feeds and candidate articles become queue tasks that any number of workers lease
+import argparse
+import multiprocessing
+import os
+import socket
+import time
+from dataclasses import asdict
+from article_records import ArticleRecord, ArticleBatch
+from host_health import HostUnavailableError
+from maharashtra_climate_news_rss import MaharashtraClimateNewsRSS
+from work_queue import open_queue
+
+
+class ScrapeWorker:
+    def __init__(self, queue, worker_id=None, lease_seconds=120, min_relevance_score=5):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.min_relevance_score = min_relevance_score
+        # Reuse the single-process scraper's screening, scoring and circuit breaker
+        self.scraper = MaharashtraClimateNewsRSS()
+
+    def handle_feed(self, payload):
+        """Fetch one feed and turn every screened entry into an article task"""
+        feed_url = payload["url"]
+        feed = self.scraper.fetch_feed(feed_url)
+
+        new_tasks = []
+        for entry in feed.entries:
+            screened = self.scraper.screen_entry(entry)
+            if screened:
+                title, summary = screened
+                new_tasks.append(("article", {
+                    "title": title,
+                    "summary": summary,
+                    "link": entry.link,
+                    "date": self.scraper.extract_date(entry),
+                    "feed_url": feed_url,
+                    "deadline": payload.get("deadline", 0)
+                }, entry.link))
+        print(f"[{self.worker_id}] {feed_url}: {len(new_tasks)} candidate articles")
+        return {"url": feed_url, "entries": len(feed.entries), "candidates": len(new_tasks)}, new_tasks
+
+    def can_wait_for(self, url, payload):
+        """True if url's host will be tried again before the task's run deadline"""
+        return time.time() + self.scraper.host_health.retry_after(url) < payload.get("deadline", 0)
+
+    def handle_article(self, payload, last_attempt=False):
+        """Fetch and score one candidate article.
+
+        Fetch errors propagate so the task is deferred or retried. On its last attempt, or when
+        the publisher's circuit stays open past the run deadline, an article is scored on title
+        and summary alone, as the single-process scraper does.
+        """
+        try:
+            full_content = self.scraper.get_article_content(payload["link"], raise_errors=True)
+        except HostUnavailableError as e:
+            if self.can_wait_for(payload["link"], payload):
+                raise
+            print(f"[{self.worker_id}] Giving up on content for {payload['link']}: {e}")
+            full_content = ""
+        except Exception as e:
+            if not last_attempt:
+                raise
+            print(f"[{self.worker_id}] Giving up on content for {payload['link']}: {e}")
+            full_content = ""
+        article = self.scraper.score_article(payload["title"], payload["summary"], payload["link"],
+                                             payload["date"], full_content, payload["feed_url"],
+                                             self.min_relevance_score)
+        if article:
+            print(f"[{self.worker_id}] Found relevant article: {article.headline} (Score: {article.relevance_score})")
+            return {"article": asdict(article)}, []
+        return {"article": None}, []
+
+    def defer(self, task, error):
+        """Hand back a task whose host's circuit is open until the breaker allows a probe.
+
+        A deferral does not use up an attempt, so deferrals stop at the run deadline: after it
+        the task fails like any other error and soon runs out of attempts.
+        """
+        url = task.payload.get("link") or task.payload["url"]
+        if self.can_wait_for(url, task.payload):
+            retry_in = max(1.0, self.scraper.host_health.retry_after(url))
+            self.queue.fail(task, error, retry_delay=retry_in, count_attempt=False)
+        else:
+            print(f"[{self.worker_id}] Run deadline passed for {task.kind} task {task.task_id}: {error}")
+            self.queue.fail(task, error, retry_delay=0)
+
+    def run(self, exit_when_idle=True, idle_sleep=1.0, save_every=50):
+        """Lease and process tasks until the queue is drained (or forever if exit_when_idle is False).
+
+        Breaker state is saved every save_every tasks and whenever the queue goes idle, so
+        long-running workers share what they learn about unhealthy hosts.
+        """
+        processed = 0
+        unsaved_tasks = 0
+        while True:
+            if unsaved_tasks >= save_every:
+                self.scraper.host_health.save()
+                unsaved_tasks = 0
+            task = self.queue.lease(self.worker_id, self.lease_seconds)
+            if task is None:
+                if unsaved_tasks:
+                    self.scraper.host_health.save()
+                    unsaved_tasks = 0
+                stats = self.queue.stats()
+                if exit_when_idle and stats["pending"] == 0 and stats["leased"] == 0:
+                    break
+                time.sleep(idle_sleep)
+                continue
+
+            unsaved_tasks += 1
+            try:
+                if task.kind == "feed":
+                    result, new_tasks = self.handle_feed(task.payload)
+                else:
+                    last_attempt = task.attempts >= self.queue.max_attempts
+                    result, new_tasks = self.handle_article(task.payload, last_attempt)
+            except HostUnavailableError as e:
+                self.defer(task, e)
+                continue
+            except Exception as e:
+                print(f"[{self.worker_id}] Error processing {task.kind} task {task.task_id}: {e}")
+                self.queue.fail(task, e)
+                continue
+
+            if self.queue.complete(task, self.worker_id, result, new_tasks):
+                processed += 1
+
+        print(f"[{self.worker_id}] Worker finished after {processed} tasks")
+        return processed
+
+
+def enqueue_feeds(queue, run_id, feeds, run_budget=1800):
+    """Coordinator step: one task per feed URL.
+
+    Tasks whose host stays unhealthy are only deferred until run_budget seconds from now.
+    """
+    deadline = time.time() + run_budget
+    added = sum(1 for feed_url in feeds
+                if queue.enqueue(run_id, "feed", {"url": feed_url, "deadline": deadline}, feed_url))
+    print(f"Queued {added} feeds for run {run_id}")
+
+
+def wait_for_run(queue, run_id, poll_interval=2.0):
+    """Block until no task in the run is pending or leased"""
+    while True:
+        stats = queue.stats(run_id)
+        print(f"Run {run_id}: {stats['pending']} pending, {stats['leased']} leased, "
+              f"{stats['done']} done, {stats['dead']} dead")
+        if stats["pending"] == 0 and stats["leased"] == 0:
+            return stats
+        time.sleep(poll_interval)
+
+
+def merge_results(queue, run_id):
+    """Collect the run's articles into one batch and save them like the single-process scraper"""
+    all_articles = ArticleBatch()
+    for result in queue.results(run_id, kind="article"):
+        if result.get("article"):
+            all_articles.append(ArticleRecord(**result["article"]))
+    print(f"Merged {len(all_articles)} articles from run {run_id}")
+    return MaharashtraClimateNewsRSS().save_results(all_articles)
+
+
+def worker_process(queue_url, lease_seconds, exit_when_idle):
+    """Entry point for a worker process - each process opens its own queue connection"""
+    queue = open_queue(queue_url)
+    try:
+        ScrapeWorker(queue, lease_seconds=lease_seconds).run(exit_when_idle=exit_when_idle)
+    finally:
+        queue.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sharded Maharashtra climate news scraping over a work queue")
+    parser.add_argument("mode", choices=["coordinator", "worker", "local"],
+                        help="coordinator: queue feeds and merge results; worker: process tasks; "
+                             "local: both, with several worker processes on this machine")
+    parser.add_argument("--queue", default="sqlite:///scrape_queue.db",
+                        help="sqlite:///path.db or redis://host:port/db")
+    parser.add_argument("--run-id", default=time.strftime("%Y%m%d-%H%M%S"),
+                        help="Run to create or merge (coordinator/local)")
+    parser.add_argument("--processes", type=int, default=4, help="Worker processes to start (worker/local)")
+    parser.add_argument("--lease-seconds", type=int, default=120,
+                        help="How long a worker may hold a task before it is handed to another worker")
+    parser.add_argument("--run-budget", type=int, default=1800,
+                        help="Seconds a run waits for unhealthy publishers before scoring without their pages")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    queue = open_queue(args.queue)
+
+    if args.mode in ("coordinator", "local"):
+        enqueue_feeds(queue, args.run_id, MaharashtraClimateNewsRSS().rss_feeds, args.run_budget)
+
+    workers = []
+    if args.mode in ("worker", "local"):
+        for _ in range(args.processes):
+            # Standalone workers keep polling for new runs; local workers stop once the run is drained
+            process = multiprocessing.Process(target=worker_process,
+                                              args=(args.queue, args.lease_seconds, args.mode == "local"))
+            process.start()
+            workers.append(process)
+
+    if args.mode in ("coordinator", "local"):
+        wait_for_run(queue, args.run_id)
+        merge_results(queue, args.run_id)
+
+    for process in workers:
+        process.join()
+    queue.close()
+
+    elapsed_time = time.time() - start_time
+    print(f"\nCompleted in {elapsed_time:.2f} seconds")
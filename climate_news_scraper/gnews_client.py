@@ -0,0 +1,284 @@
+# gnews_client.py
+# Quota-aware GNews API client: OR-combined queries, incremental time windows, on-disk response cache
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import requests
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def to_iso(moment):
+    return moment.astimezone(timezone.utc).strftime(ISO_FORMAT)
+
+
+def from_iso(text):
+    return datetime.strptime(text, ISO_FORMAT).replace(tzinfo=timezone.utc)
+
+
+class RateLimiter:
+    """Spaces requests out so concurrent threads stay under requests_per_second"""
+
+    def __init__(self, requests_per_second=1.0):
+        self.interval = 1.0 / requests_per_second
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class GNewsClient:
+    def __init__(self, api_key=None, base_url="https://gnews.io/api/v4/search", lang="en", country="in",
+                 max_per_request=10, daily_quota=100, requests_per_second=1.0, max_workers=4,
+                 cache_dir="gnews_cache", state_file="gnews_state.json", max_query_length=200,
+                 window_overlap_hours=1):
+        self.api_key = api_key or os.environ.get("GNEWS_API_KEY", "")
+        self.base_url = base_url
+        self.lang = lang
+        self.country = country
+        # Articles per request - 10 on the free plan, up to 100 on paid plans
+        self.max_per_request = max_per_request
+        # Requests allowed per UTC day
+        self.daily_quota = daily_quota
+        self.max_workers = max_workers
+        self.max_query_length = max_query_length
+        # Each new window starts this far before the previous one ended, to catch articles
+        # GNews indexed after the previous run with an earlier publish time
+        self.window_overlap = timedelta(hours=window_overlap_hours)
+        self.rate_limiter = RateLimiter(requests_per_second)
+
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Persisted between runs: requests used today and how far each query has been fetched
+        self.state_file = state_file
+        # unfinished_windows holds the older parts of windows that max_pages cut short
+        self.state = {"quota_date": "", "requests_used": 0, "last_window_end": {}, "unfinished_windows": {}}
+        self.lock = threading.Lock()
+        self.load_state()
+
+    def load_state(self):
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    self.state.update(json.load(f))
+            except Exception as e:
+                print(f"Error loading GNews state from {self.state_file}: {e}")
+
+    def save_state(self):
+        with self.lock:
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+
+    def _remaining_locked(self):
+        """Requests left today (caller holds self.lock); the counter resets at UTC midnight like the API's"""
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if self.state["quota_date"] != today:
+            self.state["quota_date"] = today
+            self.state["requests_used"] = 0
+        return max(0, self.daily_quota - self.state["requests_used"])
+
+    def remaining_quota(self):
+        """Requests left today"""
+        with self.lock:
+            return self._remaining_locked()
+
+    def _use_quota(self):
+        """Reserve one request; returns False when today's quota is spent"""
+        # Check and increment together, so concurrent queries cannot share the last request
+        with self.lock:
+            if self._remaining_locked() <= 0:
+                return False
+            self.state["requests_used"] += 1
+        return True
+
+    def combine_queries(self, keywords):
+        """OR-combine quoted keywords into as few queries as the API's length limit allows"""
+        queries = []
+        current = ""
+        for keyword in keywords:
+            term = f'"{keyword}"'
+            candidate = f"{current} OR {term}" if current else term
+            if current and len(candidate) > self.max_query_length:
+                queries.append(current)
+                current = term
+            else:
+                current = candidate
+        if current:
+            queries.append(current)
+        return queries
+
+    def _cache_path(self, params):
+        key = json.dumps({k: v for k, v in params.items() if k != "apikey"}, sort_keys=True)
+        # Prefixed with the window end so prune_cache() can tell old windows apart without opening files
+        window_end = params["to"].replace("-", "").replace(":", "")
+        return os.path.join(self.cache_dir, f"{window_end}_{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json")
+
+    def prune_cache(self, oldest):
+        """Delete cached responses for windows that ended before oldest; returns how many were deleted"""
+        cutoff = to_iso(oldest).replace("-", "").replace(":", "")
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            window_end = name.split("_", 1)[0] if "_" in name else ""
+            # Files cached before the window end was part of the name go by age instead
+            if (window_end < cutoff) if window_end else (os.path.getmtime(path) < oldest.timestamp()):
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def is_quota_error(self, response):
+        """True if an error response says the daily request limit has been reached"""
+        try:
+            errors = response.json().get("errors", "")
+        except Exception:
+            return False
+        text = json.dumps(errors).lower()
+        return "request limit" in text or "quota" in text
+
+    def request(self, params):
+        """One API call, served from the disk cache when the same query+window was fetched before"""
+        cache_path = self._cache_path(params)
+        if os.path.exists(cache_path):
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return json.load(f), True
+
+        # Without a key GNews rejects the request, but it still counts against the quota
+        if not self.api_key:
+            raise RuntimeError("GNEWS_API_KEY is not set")
+        if not self._use_quota():
+            raise RuntimeError("GNews daily quota exhausted")
+
+        self.rate_limiter.wait()
+        response = requests.get(self.base_url, params={**params, "apikey": self.api_key}, timeout=10)
+        if response.status_code == 403 and self.is_quota_error(response):
+            # Only a daily-limit 403 spends the quota; a bad key or plan restriction just fails this request
+            with self.lock:
+                self.state["requests_used"] = self.daily_quota
+        response.raise_for_status()
+        data = response.json()
+
+        if "articles" not in data:
+            raise RuntimeError(f"API Error: {data.get('errors', ['Unknown error'])}")
+
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return data, False
+
+    def search_window(self, query, window_start, window_end, max_pages=5):
+        """Fetch every article for a query in [window_start, window_end].
+
+        Results come newest first, so each further page narrows the window's end to the oldest
+        article seen so far. The end stays inclusive, so articles sharing that second are not
+        skipped; the ones already fetched are dropped by URL. Returns (articles, resume_end):
+        resume_end is None when the window was fully fetched, otherwise [window_start, resume_end]
+        is the older part still to be fetched because max_pages ran out.
+        """
+        articles = []
+        seen_urls = set()
+        page_end = window_end
+        for _ in range(max_pages):
+            params = {
+                "q": query,
+                "lang": self.lang,
+                "country": self.country,
+                "max": self.max_per_request,
+                "from": to_iso(window_start),
+                "to": to_iso(page_end),
+                "sortby": "publishedAt"
+            }
+            data, cached = self.request(params)
+            page = data["articles"]
+            new_articles = [article for article in page if article["url"] not in seen_urls]
+            seen_urls.update(article["url"] for article in new_articles)
+            articles.extend(new_articles)
+            print(f"  {'(cached) ' if cached else ''}{len(new_articles)} new articles for {query[:60]} "
+                  f"between {params['from']} and {params['to']}")
+
+            # totalArticles counts the current, already narrowed window - compare it with this page only
+            if len(page) < self.max_per_request or len(page) >= data.get("totalArticles", 0):
+                return articles, None
+            oldest = min(from_iso(article["publishedAt"]) for article in page)
+            if oldest >= page_end:
+                # A whole page published within page_end's second - the only way on is past it
+                oldest = page_end - timedelta(seconds=1)
+            page_end = oldest
+            if page_end < window_start:
+                return articles, None
+        return articles, page_end
+
+    def search(self, keywords, lookback_days=7, max_pages=5):
+        """Search all keywords since the previous run, running combined queries concurrently"""
+        # Windows end on the hour so reruns within the same hour hit the cache instead of the quota
+        window_end = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        default_start = window_end - timedelta(days=lookback_days)
+        if not self.api_key:
+            print("GNEWS_API_KEY is not set - skipping the GNews search")
+            return []
+        removed = self.prune_cache(default_start)
+        if removed:
+            print(f"Removed {removed} cached GNews responses older than {lookback_days} days")
+
+        def run_query(query):
+            """Fetch windows left unfinished by earlier runs, then the new window since the last run"""
+            windows = [(from_iso(start), from_iso(end), False)
+                       for start, end in self.state["unfinished_windows"].get(query, [])]
+            last_end = self.state["last_window_end"].get(query)
+            window_start = from_iso(last_end) - self.window_overlap if last_end else default_start
+            if window_start < window_end:
+                windows.append((window_start, window_end, True))
+
+            articles = []
+            unfinished = []
+            new_window_done = False
+            for start, end, is_new in windows:
+                try:
+                    found, resume_end = self.search_window(query, start, end, max_pages)
+                except Exception as e:
+                    print(f"Error fetching articles for query '{query}': {e}")
+                    # An old window stays unfinished; a new one is simply retried from last_window_end
+                    if not is_new:
+                        unfinished.append((start, end))
+                    continue
+                articles.extend(found)
+                if resume_end is not None:
+                    unfinished.append((start, resume_end))
+                if is_new:
+                    new_window_done = True
+            return query, articles, unfinished, new_window_done
+
+        all_articles = []
+        # Overlapping windows and queries return some articles more than once
+        seen_urls = set()
+        queries = self.combine_queries(keywords)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for query, articles, unfinished, new_window_done in executor.map(run_query, queries):
+                for article in articles:
+                    if article["url"] not in seen_urls:
+                        seen_urls.add(article["url"])
+                        all_articles.append(article)
+                with self.lock:
+                    if new_window_done:
+                        self.state["last_window_end"][query] = to_iso(window_end)
+                    if unfinished:
+                        self.state["unfinished_windows"][query] = [[to_iso(start), to_iso(end)]
+                                                                   for start, end in unfinished]
+                    else:
+                        self.state["unfinished_windows"].pop(query, None)
+
+        self.save_state()
+        return all_articles
@@ -0,0 +1,193 @@
+# host_health.py
+# Per-publisher health tracking with a circuit breaker, shared by the feed and article fetchers
+import fcntl # serialises saves from several worker processes sharing one state file
+import json
+import os
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+import requests
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# HTTP statuses that mean the publisher is down or rate limiting us
+FAILURE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HostUnavailableError(Exception):
+    """Raised instead of fetching when a host's circuit breaker is open"""
+
+
+class HostHealthTracker:
+    def __init__(self, state_file="host_health.json", failure_threshold=3,
+                 cooldown=300, max_cooldown=3600):
+        self.state_file = state_file
+        # Consecutive failures or timeouts before a host's breaker opens
+        self.failure_threshold = failure_threshold
+        # Seconds an open breaker waits before allowing a half-open probe; doubles each time a probe fails
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.hosts = {}
+        # Fetches skipped this run because the host's breaker was open
+        self.skipped = {}
+        # Successes and failures per host not yet added to the saved totals
+        self.unsaved_counts = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Load breaker state saved by previous runs"""
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                self.hosts = json.load(f)
+        except Exception as e:
+            print(f"Error loading host health from {self.state_file}: {e}")
+            self.hosts = {}
+
+    def save(self):
+        """Merge this process's breaker state into the state file for the next run.
+
+        Other worker processes may save the same file concurrently, so the merge runs under
+        a file lock: each host keeps whichever entry changed most recently, and the success
+        and failure totals from every process are added up.
+        """
+        with self.lock, open(f"{self.state_file}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                saved = {}
+                if os.path.exists(self.state_file):
+                    try:
+                        with open(self.state_file, "r", encoding="utf-8") as f:
+                            saved = json.load(f)
+                    except Exception as e:
+                        print(f"Error reading host health from {self.state_file}: {e}")
+
+                for host, entry in self.hosts.items():
+                    merged = dict(entry)
+                    saved_entry = saved.get(host)
+                    if saved_entry and saved_entry.get("updated_at", 0) > entry.get("updated_at", 0):
+                        merged = dict(saved_entry)
+                    successes, failures = self.unsaved_counts.get(host, (0, 0))
+                    merged["successes_total"] = (saved_entry or {}).get("successes_total", 0) + successes
+                    merged["failures_total"] = (saved_entry or {}).get("failures_total", 0) + failures
+                    saved[host] = merged
+
+                tmp_file = f"{self.state_file}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(saved, f, indent=2)
+                os.replace(tmp_file, self.state_file)
+                self.hosts = saved
+                self.unsaved_counts = {}
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def host_of(self, url):
+        return urlparse(url).netloc.lower()
+
+    def _entry(self, host):
+        if host not in self.hosts:
+            self.hosts[host] = {
+                "state": CLOSED, "failures": 0, "opened_at": 0.0, "cooldown": self.cooldown,
+                "probe_started": 0.0, "successes_total": 0, "failures_total": 0, "last_error": "",
+                "updated_at": 0.0
+            }
+        return self.hosts[host]
+
+    def allow(self, url):
+        """Return True if a request to this URL's host may go ahead now"""
+        host = self.host_of(url)
+        with self.lock:
+            entry = self._entry(host)
+            now = time.time()
+            if entry["state"] == OPEN:
+                if now - entry["opened_at"] < entry["cooldown"]:
+                    self.skipped[host] = self.skipped.get(host, 0) + 1
+                    return False
+                # Cooldown over - let a single probe through
+                entry["state"] = HALF_OPEN
+                entry["probe_started"] = now
+                entry["updated_at"] = now
+                return True
+            if entry["state"] == HALF_OPEN:
+                # Only one probe at a time; a probe that never reported back is retried after the cooldown
+                if now - entry["probe_started"] < entry["cooldown"]:
+                    self.skipped[host] = self.skipped.get(host, 0) + 1
+                    return False
+                entry["probe_started"] = now
+            return True
+
+    def retry_after(self, url):
+        """Seconds until this URL's host may be tried again (0 if allow() would let it through now)"""
+        with self.lock:
+            entry = self.hosts.get(self.host_of(url))
+            if not entry or entry["state"] == CLOSED:
+                return 0.0
+            since = entry["opened_at"] if entry["state"] == OPEN else entry["probe_started"]
+            return max(0.0, since + entry["cooldown"] - time.time())
+
+    def record_success(self, url):
+        host = self.host_of(url)
+        with self.lock:
+            entry = self._entry(host)
+            entry["state"] = CLOSED
+            entry["failures"] = 0
+            entry["cooldown"] = self.cooldown
+            entry["successes_total"] += 1
+            entry["updated_at"] = time.time()
+            counts = self.unsaved_counts.get(host, (0, 0))
+            self.unsaved_counts[host] = (counts[0] + 1, counts[1])
+
+    def record_failure(self, url, error):
+        host = self.host_of(url)
+        with self.lock:
+            entry = self._entry(host)
+            entry["failures"] += 1
+            entry["failures_total"] += 1
+            entry["last_error"] = str(error)[:200]
+            entry["updated_at"] = time.time()
+            counts = self.unsaved_counts.get(host, (0, 0))
+            self.unsaved_counts[host] = (counts[0], counts[1] + 1)
+            if entry["state"] == HALF_OPEN:
+                # Failed probe - reopen with a longer cooldown
+                entry["state"] = OPEN
+                entry["opened_at"] = time.time()
+                entry["cooldown"] = min(entry["cooldown"] * 2, self.max_cooldown)
+            elif entry["state"] == CLOSED and entry["failures"] >= self.failure_threshold:
+                entry["state"] = OPEN
+                entry["opened_at"] = time.time()
+
+    def fetch(self, url, **kwargs):
+        """requests.get through the breaker; raises HostUnavailableError if the host is unhealthy"""
+        if not self.allow(url):
+            raise HostUnavailableError(f"Skipping {url}: circuit open for {self.host_of(url)}")
+        try:
+            response = requests.get(url, **kwargs)
+        except requests.RequestException as e:
+            self.record_failure(url, e)
+            raise
+        if response.status_code in FAILURE_STATUSES:
+            self.record_failure(url, f"HTTP {response.status_code}")
+            response.raise_for_status()
+        self.record_success(url)
+        return response
+
+    def print_report(self):
+        """Print breaker state for every host seen so far"""
+        print("\nPublisher Health:")
+        if not self.hosts:
+            print("  (no hosts contacted)")
+            return
+        for host, entry in sorted(self.hosts.items()):
+            line = (f"  - {host}: {entry['state']} | ok {entry['successes_total']} | "
+                    f"failed {entry['failures_total']}")
+            if self.skipped.get(host):
+                line += f" | skipped this run {self.skipped[host]}"
+            if entry["state"] != CLOSED:
+                retry_in = max(0, entry["opened_at"] + entry["cooldown"] - time.time())
+                line += f" | retry in {retry_in:.0f}s | last error: {entry['last_error']}"
+            print(line)
@@ -0,0 +1,77 @@
+# load_test_query_service.py
+# Fires concurrent queries at climate_news_query_service.py and reports latency percentiles
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+QUERIES = [
+    {"q": "flood"},
+    {"q": "heavy rain", "location": "mumbai"},
+    {"keyword": "drought", "k": 5},
+    {"location": "pune", "impact": "disaster impact"},
+    {"q": "monsoon farmers", "k": 20},
+    {"keyword": "rainfall", "from": "2024-01-01", "to": "2024-12-31"},
+    {}
+]
+
+
+def seed_articles(base_url, count):
+    """POST synthetic articles so the test has something to search"""
+    keywords = ["drought", "flood", "rainfall", "heatwave", "monsoon"]
+    places = ["Mumbai", "Pune", "Nagpur", "Nashik", "Kolhapur", "Marathwada"]
+    articles = []
+    for i in range(count):
+        keyword = random.choice(keywords)
+        place = random.choice(places)
+        articles.append({
+            "headline": f"{keyword.title()} hits {place} as heavy rain and farmers worry, report {i}",
+            "url": f"https://example.com/load-test/{i}",
+            "date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "keyword": keyword,
+            "relevance_score": random.uniform(5, 40)
+        })
+    body = json.dumps(articles).encode("utf-8")
+    with urlopen(f"{base_url}/articles", data=body) as response:
+        print(f"Seeded articles: {json.loads(response.read())}")
+
+
+def timed_query(base_url, params):
+    """Run one search and return (client latency ms, server-side ms)"""
+    start_time = time.perf_counter()
+    with urlopen(f"{base_url}/search?{urlencode(params)}") as response:
+        payload = json.loads(response.read())
+    return (time.perf_counter() - start_time) * 1000, payload["took_ms"]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run_load_test(base_url, requests_total=2000, concurrency=16):
+    """Send requests_total queries with the given concurrency"""
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: timed_query(base_url, random.choice(QUERIES)),
+                                    range(requests_total)))
+    elapsed_time = time.time() - start_time
+
+    client_ms = [r[0] for r in results]
+    server_ms = [r[1] for r in results]
+    # Client latency is the headline: it includes connection setup and queueing the index lookup does not see
+    print(f"\n{requests_total} queries, concurrency {concurrency}, {requests_total / elapsed_time:.0f} queries/s, "
+          f"client p99 {percentile(client_ms, 99):.2f} ms")
+    for label, values in (("client latency", client_ms), ("index lookup", server_ms)):
+        print(f"{label:<15} p50 {percentile(values, 50):7.2f} ms   p95 {percentile(values, 95):7.2f} ms   "
+              f"p99 {percentile(values, 99):7.2f} ms")
+
+if __name__ == "__main__":
+    base_url = sys.argv[1] if len(sys.argv) > 1 else "http://127.0.0.1:8765"
+    seed_count = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    if seed_count:
+        seed_articles(base_url, seed_count)
+    run_load_test(base_url)
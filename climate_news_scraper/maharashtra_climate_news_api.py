@@ -1,12 +1,13 @@
 # RSS is Really Simple Syndication or Rich Siter Summary, the main  purpose is to expose RESTful API that returns the data
 # maharashtra_climate_news_rss.py
 import feedparser # fetch and extract information like links and headlines from the articles
-import pandas as pd # for data manipulation and analysis and store them in .csv files
 import time
 import re # regular expression module for pattern matching
 from datetime import datetime, timedelta
-import requests # library to make requests
 from bs4 import BeautifulSoup # a library to parse and extract information from HTML and XML documents
+from article_records import ArticleRecord, ArticleBatch # shared typed article storage, written to .csv files via pandas
+from host_health import HostHealthTracker # per-publisher circuit breaker so dead hosts fail fast
+from raw_archive import RawPageArchive # raw copies of fetched pages, for rescoring without the network
 
 class MaharashtraClimateNewsRSS:
     def __init__(self):
@@ -40,14 +41,27 @@ class MaharashtraClimateNewsRSS:
             "https://timesofindia.indiatimes.com/rssfeeds/-2128838597.cms",  # Maharashtra TOI
             "https://www.hindustantimes.com/feeds/rss/cities/mumbai-news/rssfeed.xml"  # HT Mumbai
         ]
+        
+        # Columns written to the results CSV
+        self.csv_columns = ("headline", "date", "url", "summary", "climate_score", "location_score", "relevance_score")
+        
+        # Browser-like headers used for feed and article requests
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        }
+        
+        # Per-host circuit breaker shared by feed and article fetches, persisted between runs
+        self.host_health = HostHealthTracker()
+        
+        # Every fetched feed and article page is kept here so results can be rescored offline
+        self.archive = RawPageArchive()
     
     def get_article_content(self, url):
         """Fetch and extract content from the article URL"""
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=10)
+            # Fails fast with HostUnavailableError if the publisher's circuit is open
+            response = self.host_health.fetch(url, headers=self.headers, timeout=10)
+            self.archive.append("article", url, response.content)
             soup = BeautifulSoup(response.content, 'html.parser')
             
             # Extract paragraphs
@@ -107,12 +121,15 @@ class MaharashtraClimateNewsRSS:
     
     def fetch_and_filter_articles(self, min_relevance_score=5):
         """Fetch articles from RSS feeds and filter for climate news in Maharashtra with improved relevance"""
-        all_articles = []
+        all_articles = ArticleBatch()
         
         for feed_url in self.rss_feeds:
             try:
                 print(f"Fetching from: {feed_url}")
-                feed = feedparser.parse(feed_url)
+                # Fetch through the breaker so dead feeds are skipped instead of retried every run
+                response = self.host_health.fetch(feed_url, headers=self.headers, timeout=10)
+                self.archive.append("feed", feed_url, response.content)
+                feed = feedparser.parse(response.content)
                 
                 for entry in feed.entries:
                     # Skip if not recent
@@ -149,15 +166,16 @@ class MaharashtraClimateNewsRSS:
 
                             pub_date = self.extract_date(entry)
 
-                            article = {
-                                'Headline': entry.title,
-                                'Date': pub_date,
-                                'Link': entry.link,
-                                'Summary': summary[:150] + "..." if len(summary) > 150 else summary,
-                                'Climate_Score': climate_score,
-                                'Location_Score': location_score,
-                                'Relevance_Score': relevance_score
-                            }
+                            article = ArticleRecord(
+                                headline=entry.title,
+                                date=pub_date,
+                                url=entry.link,
+                                summary=summary[:150] + "..." if len(summary) > 150 else summary,
+                                source=feed_url,
+                                climate_score=climate_score,
+                                location_score=location_score,
+                                relevance_score=relevance_score
+                            )
                             all_articles.append(article)
                             print(f"Found relevant article: {entry.title} (Score: {relevance_score})")
             
@@ -175,34 +193,27 @@ class MaharashtraClimateNewsRSS:
         fetch_time = time.time() - start_time
         print(f"Fetching completed in {fetch_time:.2f} seconds, found {len(all_articles)} articles")
         
-        # Remove duplicates based on headlines (case-insensitive)
-        unique_headlines = set()
-        unique_articles = []
+        # Report and persist publisher breaker state for the next run
+        self.host_health.print_report()
+        self.host_health.save()
         
-        for article in all_articles:
-            headline_lower = article['Headline'].lower()
-            if headline_lower not in unique_headlines:
-                unique_headlines.add(headline_lower)
-                unique_articles.append(article)
+        # Remove duplicates based on headlines (case-insensitive)
+        headlines = all_articles.column('headline')
+        unique_articles = all_articles.unique_by(lambda i: headlines[i].lower())
         
-        sorted_articles = sorted(unique_articles, key=lambda x: x['Relevance_Score'], reverse=True)
+        sorted_articles = unique_articles.sorted_by('relevance_score', reverse=True)
         
-        # Convert to DataFrame and save as CSV
+        # Save as CSV straight from the columnar batch
         if sorted_articles:
-            df = pd.DataFrame(sorted_articles)
             csv_filename = f"maharashtra_climate_news_{time.strftime('%Y%m%d-%H%M%S')}.csv"
-            df.to_csv(csv_filename, index=False)
+            sorted_articles.to_csv(csv_filename, columns=self.csv_columns)
             print(f"\nSaved {len(sorted_articles)} unique articles to {csv_filename}")
             
             print("\nTop Results:")
-            if len(sorted_articles) > 10:
-                display_articles = sorted_articles[:10]
-            else:
-                display_articles = sorted_articles
-                
-            for idx, article in enumerate(display_articles, 1):
-                print(f"{idx}. {article['Headline']} (Score: {article['Relevance_Score']:.1f})")
-                print(f"   Date: {article['Date']} | Link: {article['Link']}")
+            for idx in range(min(10, len(sorted_articles))):
+                article = sorted_articles.record(idx)
+                print(f"{idx + 1}. {article.headline} (Score: {article.relevance_score:.1f})")
+                print(f"   Date: {article.date} | Link: {article.url}")
                 print()
             
             return csv_filename
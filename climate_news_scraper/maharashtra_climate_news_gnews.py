@@ -1,7 +1,7 @@
 # maharashtra_climate_news_gnews.py
-import requests
-import pandas as pd
 import time
+from article_records import ArticleRecord, ArticleBatch
+from gnews_client import GNewsClient
 
 class MaharashtraClimateNewsGNews:
     def __init__(self):
@@ -14,71 +14,46 @@ class MaharashtraClimateNewsGNews:
             "Maharashtra monsoon"
         ]
         
-        # Base URL for GNews API
-        self.base_url = "https://gnews.io/api/v4/search"
+        # Columns written to the results CSV
+        self.csv_columns = ("headline", "url", "date")
         
-    def fetch_articles(self, query):
-        """Fetch articles for a specific query"""
-        params = {
-            'q': query,
-            'lang': 'en',
-            'country': 'in',
-            'max': 10  # Number of results per query
-        }
-        
-        try:
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()  # Raise exception for HTTP errors
-            data = response.json()
-            
-            if 'articles' in data:
-                return data['articles']
-            else:
-                print(f"API Error: {data.get('errors', ['Unknown error'])}")
-                return []
-        except Exception as e:
-            print(f"Error fetching articles for query '{query}': {e}")
-            return []
+        # Batches keywords into OR queries, only asks for articles newer than the last run,
+        # caches responses on disk and tracks the daily request quota (API key from GNEWS_API_KEY)
+        self.client = GNewsClient()
     
     def run_api_search(self):
         """Main method to run the API search"""
-        all_articles = []
-        
-        # Search for each keyword
-        for keyword in self.keywords:
-            print(f"Searching for: {keyword}")
-            articles = self.fetch_articles(keyword)
-            print(f"Found {len(articles)} articles for '{keyword}'")
-            all_articles.extend(articles)
-            # Be nice to the API with a short delay
-            time.sleep(1)
+        print(f"Searching for: {', '.join(self.keywords)}")
+        print(f"GNews requests left today: {self.client.remaining_quota()}")
+        all_articles = self.client.search(self.keywords)
+        print(f"Found {len(all_articles)} articles, {self.client.remaining_quota()} GNews requests left today")
         
         # Remove duplicates based on URL
         unique_urls = set()
-        unique_articles = []
+        unique_articles = ArticleBatch()
         
         for article in all_articles:
             if article['url'] not in unique_urls:
                 unique_urls.add(article['url'])
                 # Extract only needed fields
-                unique_articles.append({
-                    'Headline': article['title'],
-                    'Link': article['url'],
-                    'Published': article['publishedAt']
-                })
+                unique_articles.append(ArticleRecord(
+                    headline=article['title'],
+                    url=article['url'],
+                    date=article['publishedAt'],
+                    source=article.get('source', {}).get('name', "")
+                ))
         
-        # Convert to DataFrame and save as CSV
+        # Save as CSV straight from the columnar batch
         if unique_articles:
-            df = pd.DataFrame(unique_articles)
             csv_filename = f"maharashtra_climate_news_{time.strftime('%Y%m%d-%H%M%S')}.csv"
-            df.to_csv(csv_filename, index=False)
+            unique_articles.to_csv(csv_filename, columns=self.csv_columns)
             print(f"\nSaved {len(unique_articles)} unique articles to {csv_filename}")
             
-            # Display the dataframe in terminal
+            # Display the first results in terminal
             print("\nSearch Results:")
-            print(df[['Headline', 'Link']].head(10))  # Show first 10 results
-            if len(df) > 10:
-                print(f"...and {len(df) - 10} more results")
+            print(unique_articles.take(range(min(10, len(unique_articles)))).to_dataframe(['headline', 'url']))
+            if len(unique_articles) > 10:
+                print(f"...and {len(unique_articles) - 10} more results")
             
             return csv_filename
         else:
@@ -1,11 +1,15 @@
 # maharashtra_climate_news_rss.py
+import argparse
 import feedparser
-import pandas as pd
 import time
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-import requests
+from itertools import repeat
 from bs4 import BeautifulSoup
+from article_records import ArticleRecord, ArticleBatch
+from host_health import HostHealthTracker
+from raw_archive import RawPageArchive
 
 class MaharashtraClimateNewsRSS:
     def __init__(self):
@@ -40,25 +44,53 @@ class MaharashtraClimateNewsRSS:
             "https://indianexpress.com/section/cities/mumbai/feed/",  # IE Mumbai
             "https://indianexpress.com/section/cities/pune/feed/"  # IE Pune
         ]
+        
+        # Columns written to the results CSV (read by climate_news_analyzer.py)
+        self.csv_columns = ("headline", "date", "url", "keyword", "sentiment", "relevance_score")
+        
+        # Browser-like headers used for feed and article requests
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        }
+        
+        # Per-host circuit breaker shared by feed and article fetches, persisted between runs
+        self.host_health = HostHealthTracker()
+        
+        # Every fetched feed and article page is kept here so results can be rescored offline
+        self.archive = RawPageArchive()
+    
+    def fetch_feed(self, feed_url):
+        """Fetch, archive and parse one RSS feed"""
+        # Fetch through the breaker so dead feeds are skipped instead of retried every run
+        response = self.host_health.fetch(feed_url, headers=self.headers, timeout=10)
+        self.archive.append("feed", feed_url, response.content)
+        return feedparser.parse(response.content)
+    
+    def extract_article_text(self, html):
+        """Extract the paragraph text from an article page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract paragraphs
+        paragraphs = soup.find_all('p')
+        text = ' '.join([p.get_text() for p in paragraphs])
+        
+        # Remove extra whitespace
+        return re.sub(r'\s+', ' ', text).strip()
     
-    def get_article_content(self, url):
-        """Fetch and extract content from the article URL"""
+    def get_article_content(self, url, raise_errors=False):
+        """Fetch and extract content from the article URL.
+
+        Fetch errors are printed and give "" unless raise_errors is set, in which case
+        they propagate (HostUnavailableError when the publisher's circuit is open).
+        """
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract paragraphs
-            paragraphs = soup.find_all('p')
-            text = ' '.join([p.get_text() for p in paragraphs])
-            
-            # Remove extra whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            return text
+            # Fails fast with HostUnavailableError if the publisher's circuit is open
+            response = self.host_health.fetch(url, headers=self.headers, timeout=10)
+            self.archive.append("article", url, response.content)
+            return self.extract_article_text(response.content)
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error fetching content from {url}: {e}")
             return ""
     
@@ -114,73 +146,91 @@ class MaharashtraClimateNewsRSS:
         # If at least 3 common English words are present, consider it English
         return marker_count >= 3
     
+    def screen_entry(self, entry):
+        """Cheap checks on a feed entry; returns (title, summary) if it is worth fetching, else None"""
+        # Skip if not recent (last 6 months)
+        if not self.is_recent(entry, max_months=6):
+            return None
+            
+        title = entry.title if hasattr(entry, 'title') else ""
+        summary = entry.summary if hasattr(entry, 'summary') else ""
+        
+        # Check if content appears to be in English
+        if not self.is_english(f"{title} {summary}"):
+            return None
+        
+        # Combine title and summary for initial screening
+        initial_text = f"{title} {summary}".lower()
+        
+        # Initial screening for at least one climate keyword and one location keyword
+        has_climate_keyword = any(keyword.lower() in initial_text for keyword in self.climate_keywords)
+        has_location_keyword = any(keyword.lower() in initial_text for keyword in self.location_keywords)
+        
+        if has_climate_keyword and has_location_keyword:
+            return title, summary
+        return None
+    
+    def score_article(self, title, summary, link, pub_date, full_content, feed_url, min_relevance_score=5):
+        """Score an article's text; returns an ArticleRecord if it clears the threshold, else None"""
+        all_content = f"{title} {summary} {full_content}" if full_content else f"{title} {summary}"
+        
+        # Calculate separate scores
+        climate_score = self.calculate_relevance_score(all_content, self.climate_keywords)
+        location_score = self.calculate_relevance_score(all_content, self.location_keywords)
+        
+        # Combined relevance score - we want both climate and location to be relevant
+        # Taking the minimum ensures both aspects must be present
+        relevance_score = min(climate_score, location_score/2)
+        
+        # Only include if relevance score is above threshold
+        if relevance_score < min_relevance_score:
+            return None
+        
+        # Extract primary keyword - which climate term is most frequent
+        primary_keyword = max(self.climate_keywords.items(), 
+                             key=lambda kw: all_content.lower().count(kw[0].lower()))[0]
+        
+        return ArticleRecord(
+            headline=title,
+            date=pub_date,
+            url=link,
+            keyword=primary_keyword,
+            sentiment="Neutral (0.0)",  # Default sentiment
+            summary=summary,
+            source=feed_url,
+            relevance_score=relevance_score,
+            climate_score=climate_score,
+            location_score=location_score
+        )
+    
     def fetch_and_filter_articles(self, min_relevance_score=5):
         """Fetch articles from RSS feeds and filter for climate news in Maharashtra with improved relevance"""
-        all_articles = []
+        all_articles = ArticleBatch()
         
         for feed_url in self.rss_feeds:
             try:
                 print(f"Fetching from: {feed_url}")
-                feed = feedparser.parse(feed_url)
+                feed = self.fetch_feed(feed_url)
                 
                 for entry in feed.entries:
-                    # Skip if not recent (last 6 months)
-                    if not self.is_recent(entry, max_months=6):
-                        continue
-                        
-                    title = entry.title if hasattr(entry, 'title') else ""
-                    summary = entry.summary if hasattr(entry, 'summary') else ""
-                    
-                    # Check if content appears to be in English
-                    if not self.is_english(f"{title} {summary}"):
-                        continue
-                    
-                    # Combine title and summary for initial screening
-                    initial_text = f"{title} {summary}".lower()
-                    
-                    # Initial screening for at least one climate keyword and one location keyword
-                    has_climate_keyword = any(keyword.lower() in initial_text for keyword in self.climate_keywords)
-                    has_location_keyword = any(keyword.lower() in initial_text for keyword in self.location_keywords)
+                    screened = self.screen_entry(entry)
                     
                     # Only proceed with full content analysis if initial screening passes
-                    if has_climate_keyword and has_location_keyword:
+                    if screened:
+                        title, summary = screened
                         # If needed, get full content for better analysis
                         print(f"Found potential match: {title}")
                         try:
                             full_content = self.get_article_content(entry.link)
-                            all_content = f"{title} {summary} {full_content}"
                         except:
                             # If content fetch fails, just use title and summary
-                            all_content = f"{title} {summary}"
+                            full_content = ""
                         
-                        # Calculate separate scores
-                        climate_score = self.calculate_relevance_score(all_content, self.climate_keywords)
-                        location_score = self.calculate_relevance_score(all_content, self.location_keywords)
-                        
-                        # Combined relevance score - we want both climate and location to be relevant
-                        # Taking the minimum ensures both aspects must be present
-                        relevance_score = min(climate_score, location_score/2)
-                        
-                        # Only include if relevance score is above threshold
-                        if relevance_score >= min_relevance_score:
-                            # Extract date
-                            pub_date = self.extract_date(entry)
-                            
-                            # Extract primary keyword - which climate term is most frequent
-                            primary_keyword = max(self.climate_keywords.items(), 
-                                                 key=lambda kw: all_content.lower().count(kw[0].lower()))[0]
-                            
-                            # Create article entry
-                            article = {
-                                'headline': entry.title,
-                                'date': pub_date,
-                                'url': entry.link,
-                                'keyword': primary_keyword,
-                                'sentiment': "Neutral (0.0)",  # Default sentiment
-                                'relevance_score': relevance_score
-                            }
+                        article = self.score_article(title, summary, entry.link, self.extract_date(entry),
+                                                     full_content, feed_url, min_relevance_score)
+                        if article:
                             all_articles.append(article)
-                            print(f"Found relevant article: {entry.title} (Score: {relevance_score})")
+                            print(f"Found relevant article: {article.headline} (Score: {article.relevance_score})")
             
             except Exception as e:
                 print(f"Error fetching from {feed_url}: {e}")
@@ -188,56 +238,116 @@ class MaharashtraClimateNewsRSS:
         
         return all_articles
     
-    def run_rss_search(self):
-        """Main method to run the RSS search"""
-        print("Fetching climate news about Maharashtra from RSS feeds...")
-        start_time = time.time()
-        all_articles = self.fetch_and_filter_articles()
-        fetch_time = time.time() - start_time
-        print(f"Fetching completed in {fetch_time:.2f} seconds, found {len(all_articles)} articles")
-        
+    def save_results(self, all_articles):
+        """De-duplicate, sort and save a batch of articles; returns the CSV filename or None"""
         # Remove duplicates based on headlines (case-insensitive)
-        unique_headlines = set()
-        unique_articles = []
-        
-        for article in all_articles:
-            headline_lower = article['headline'].lower()
-            if headline_lower not in unique_headlines:
-                unique_headlines.add(headline_lower)
-                unique_articles.append(article)
+        headlines = all_articles.column('headline')
+        unique_articles = all_articles.unique_by(lambda i: headlines[i].lower())
         
         # Sort by relevance score
-        sorted_articles = sorted(unique_articles, key=lambda x: x['relevance_score'], reverse=True)
+        sorted_articles = unique_articles.sorted_by('relevance_score', reverse=True)
         
-        # Convert to DataFrame and save as CSV
+        # Save as CSV straight from the columnar batch
         if sorted_articles:
-            df = pd.DataFrame(sorted_articles)
             csv_filename = f"maharashtra_climate_news_{time.strftime('%Y%m%d-%H%M%S')}.csv"
-            df.to_csv(csv_filename, index=False)
+            sorted_articles.to_csv(csv_filename, columns=self.csv_columns)
             print(f"\nSaved {len(sorted_articles)} unique articles to {csv_filename}")
             
             # Display the top 10 results in terminal
             print("\nTop Results:")
-            if len(sorted_articles) > 10:
-                display_articles = sorted_articles[:10]
-            else:
-                display_articles = sorted_articles
-                
-            for idx, article in enumerate(display_articles, 1):
-                print(f"{idx}. {article['headline']} (Score: {article['relevance_score']:.1f})")
-                print(f"   Date: {article['date']} | Keyword: {article['keyword']}")
-                print(f"   URL: {article['url']}")
+            for idx in range(min(10, len(sorted_articles))):
+                article = sorted_articles.record(idx)
+                print(f"{idx + 1}. {article.headline} (Score: {article.relevance_score:.1f})")
+                print(f"   Date: {article.date} | Keyword: {article.keyword}")
+                print(f"   URL: {article.url}")
                 print()
             
             return csv_filename
         else:
             print("\nNo relevant articles were found.")
             return None
+    
+    def run_rss_search(self):
+        """Main method to run the RSS search"""
+        print("Fetching climate news about Maharashtra from RSS feeds...")
+        start_time = time.time()
+        all_articles = self.fetch_and_filter_articles()
+        fetch_time = time.time() - start_time
+        print(f"Fetching completed in {fetch_time:.2f} seconds, found {len(all_articles)} articles")
+        
+        # Report and persist publisher breaker state for the next run
+        self.host_health.print_report()
+        self.host_health.save()
+        
+        return self.save_results(all_articles)
+    
+    def rescore_archive(self, min_relevance_score=5, since=None, processes=None):
+        """Re-run screening and scoring over the raw page archive, without any network access"""
+        feed_entries = self.archive.entries("feed", since)
+        print(f"Rescoring {len(feed_entries)} archived feed documents...")
+        start_time = time.time()
+        
+        all_articles = ArticleBatch()
+        # Workers score with this instance's keyword weights, so tweaked weights take effect
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_rescore_worker,
+                                 initargs=(self.climate_keywords, self.location_keywords,
+                                           self.archive.archive_path)) as executor:
+            for articles in executor.map(rescore_feed_document, feed_entries, repeat(min_relevance_score),
+                                         chunksize=8):
+                all_articles.extend(articles)
+        
+        rescore_time = time.time() - start_time
+        print(f"Rescoring completed in {rescore_time:.2f} seconds, found {len(all_articles)} articles")
+        return self.save_results(all_articles)
+
+# Per-process scraper and article page lookup for rescore_feed_document
+_rescore_state = {}
+
+def init_rescore_worker(climate_keywords, location_keywords, archive_path):
+    """Process-pool initializer: a scraper with the caller's keyword weights and archive"""
+    scraper = MaharashtraClimateNewsRSS()
+    scraper.climate_keywords = climate_keywords
+    scraper.location_keywords = location_keywords
+    scraper.archive = RawPageArchive(archive_path)
+    _rescore_state["scraper"] = scraper
+    _rescore_state["pages"] = scraper.archive.latest_by_url("article")
+
+def rescore_feed_document(entry, min_relevance_score):
+    """Process-pool worker: score the entries of one archived feed against the archived article pages"""
+    scraper = _rescore_state["scraper"]
+    pages = _rescore_state["pages"]
+    
+    feed = feedparser.parse(scraper.archive.read(entry))
+    articles = []
+    for feed_entry in feed.entries:
+        screened = scraper.screen_entry(feed_entry)
+        if not screened:
+            continue
+        title, summary = screened
+        page = pages.get(feed_entry.link)
+        full_content = scraper.extract_article_text(scraper.archive.read(page)) if page else ""
+        article = scraper.score_article(title, summary, feed_entry.link, scraper.extract_date(feed_entry),
+                                        full_content, entry["url"], min_relevance_score)
+        if article:
+            articles.append(article)
+    return articles
 
 if __name__ == "__main__":
-    print("Starting Maharashtra Climate News RSS Search")
+    parser = argparse.ArgumentParser(description="Maharashtra climate news from RSS feeds")
+    parser.add_argument("mode", nargs="?", choices=["search", "rescore"], default="search",
+                        help="search: fetch the feeds (default); rescore: re-score the raw page archive offline")
+    parser.add_argument("--since", help="Only rescore pages fetched on or after this day (YYYY-MM-DD)")
+    parser.add_argument("--min-score", type=float, default=5, help="Minimum relevance score when rescoring")
+    parser.add_argument("--processes", type=int, help="Rescoring processes (default: one per CPU)")
+    args = parser.parse_args()
+    
     start_time = time.time()
     rss_feed = MaharashtraClimateNewsRSS()
-    rss_feed.run_rss_search()
+    if args.mode == "rescore":
+        print("Starting Maharashtra Climate News Rescore")
+        rss_feed.rescore_archive(args.min_score, args.since, args.processes)
+    else:
+        print("Starting Maharashtra Climate News RSS Search")
+        rss_feed.run_rss_search()
     elapsed_time = time.time() - start_time
     print(f"\nCompleted in {elapsed_time:.2f} seconds")
\ No newline at end of file
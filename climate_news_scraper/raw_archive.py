@@ -0,0 +1,102 @@
+# raw_archive.py
+# Append-only archive of fetched feed documents and article pages, for re-scoring without the network
+import fcntl # file locking so several worker processes can append to the same archive
+import json
+import mmap
+import os
+import time
+import zlib
+
+try:
+    import zstandard # optional - preferred codec, falls back to zlib when not installed
+except ImportError:
+    zstandard = None
+
+
+class RawPageArchive:
+    """Compressed frames appended to one data file, with a JSON-lines offset index beside it"""
+
+    def __init__(self, archive_path="raw_pages.arc", level=3):
+        self.archive_path = archive_path
+        self.index_path = f"{archive_path}.idx"
+        self.level = level
+        self.codec = "zstd" if zstandard else "zlib"
+        self._compressor = zstandard.ZstdCompressor(level=level) if zstandard else None
+        self._mmap = None
+        self._mmap_size = 0
+
+    def compress(self, body):
+        if self.codec == "zstd":
+            return self._compressor.compress(body)
+        return zlib.compress(body, self.level)
+
+    def decompress(self, frame, codec):
+        if codec == "zstd":
+            if zstandard is None:
+                raise ImportError("zstandard is required to read zstd frames; install it with 'pip install zstandard'")
+            return zstandard.ZstdDecompressor().decompress(frame)
+        return zlib.decompress(frame)
+
+    def append(self, kind, url, body, source=""):
+        """Store one fetched document ('feed' or 'article') as its own compressed frame"""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        frame = self.compress(body)
+
+        with open(self.archive_path, "ab") as data_file, open(self.index_path, "a", encoding="utf-8") as index_file:
+            # One lock covers both files so frames and index lines stay in the same order
+            fcntl.flock(data_file, fcntl.LOCK_EX)
+            try:
+                data_file.seek(0, os.SEEK_END)
+                offset = data_file.tell()
+                data_file.write(frame)
+                data_file.flush()
+                entry = {
+                    "offset": offset, "length": len(frame), "codec": self.codec, "kind": kind,
+                    "url": url, "source": source, "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+                }
+                index_file.write(json.dumps(entry) + "\n")
+                index_file.flush()
+            finally:
+                fcntl.flock(data_file, fcntl.LOCK_UN)
+        return entry
+
+    def entries(self, kind=None, since=None):
+        """Index entries in archive order, optionally filtered by kind and fetch date ('YYYY-MM-DD')"""
+        if not os.path.exists(self.index_path):
+            return []
+        selected = []
+        with open(self.index_path, "r", encoding="utf-8") as index_file:
+            for line in index_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted run
+                    continue
+                if kind and entry["kind"] != kind:
+                    continue
+                if since and entry["fetched_at"][:10] < since:
+                    continue
+                selected.append(entry)
+        return selected
+
+    def latest_by_url(self, kind):
+        """Map each URL to its most recently archived entry of the given kind"""
+        return {entry["url"]: entry for entry in self.entries(kind)}
+
+    def read(self, entry):
+        """Return the decompressed document for an index entry, reading through mmap"""
+        end = entry["offset"] + entry["length"]
+        if self._mmap is None or end > self._mmap_size:
+            # The archive grew since it was mapped - map it again
+            self.close()
+            with open(self.archive_path, "rb") as data_file:
+                self._mmap = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmap_size = len(self._mmap)
+        return self.decompress(self._mmap[entry["offset"]:end], entry["codec"])
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self._mmap_size = 0
@@ -0,0 +1,326 @@
+# work_queue.py
+# Durable task queue for sharded scraping: SQLite locally, Redis when workers run on several machines
+import hashlib
+import json
+import sqlite3
+import time
+import uuid
+from collections import namedtuple
+from urllib.parse import urlparse
+
+# A leased unit of work; lease_token must be passed back to complete() / fail()
+Task = namedtuple("Task", ["task_id", "run_id", "kind", "payload", "attempts", "lease_token"])
+
+
+def make_task_id(run_id, kind, key):
+    """Stable task id, so enqueueing the same feed or article twice in a run is a no-op"""
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+    return f"{run_id}:{kind}:{digest}"
+
+
+def open_queue(queue_url, **kwargs):
+    """Open a queue from a URL: sqlite:///path/to/queue.db or redis://host:port/db"""
+    scheme = urlparse(queue_url).scheme
+    if scheme == "sqlite":
+        return SQLiteWorkQueue(queue_url[len("sqlite:///"):], **kwargs)
+    if scheme in ("redis", "rediss"):
+        return RedisWorkQueue(queue_url, **kwargs)
+    raise ValueError(f"Unsupported queue URL: {queue_url}")
+
+
+class SQLiteWorkQueue:
+    """Queue stored in a single SQLite file, safe to share between processes on one machine"""
+
+    def __init__(self, db_path="scrape_queue.db", max_attempts=3):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_token TEXT,
+                lease_expires REAL,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, available_at);
+            CREATE TABLE IF NOT EXISTS results (
+                task_id TEXT PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                result TEXT,
+                worker TEXT,
+                completed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS results_run ON results (run_id);
+        """)
+
+    def _insert_task(self, run_id, kind, payload, task_id, now):
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO tasks (task_id, run_id, kind, payload, available_at) VALUES (?, ?, ?, ?, ?)",
+            (task_id, run_id, kind, json.dumps(payload), now))
+        return cursor.rowcount == 1
+
+    def enqueue(self, run_id, kind, payload, key):
+        """Add a task; returns False if a task with the same key already exists in this run"""
+        task_id = make_task_id(run_id, kind, key)
+        return self._insert_task(run_id, kind, payload, task_id, time.time())
+
+    def lease(self, worker_id, lease_seconds=120):
+        """Claim the next ready task (or one whose lease expired); returns a Task or None"""
+        now = time.time()
+        token = uuid.uuid4().hex
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Tasks whose workers died mid-lease and have used up their attempts are given up on
+            self.conn.execute(
+                "UPDATE tasks SET status = 'dead', last_error = 'lease expired' "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts))
+            row = self.conn.execute(
+                "SELECT task_id, run_id, kind, payload, attempts FROM tasks "
+                "WHERE (status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY available_at LIMIT 1",
+                (now, now)).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            task_id, run_id, kind, payload, attempts = row
+            self.conn.execute(
+                "UPDATE tasks SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                "lease_token = ?, lease_expires = ? WHERE task_id = ?",
+                (worker_id, token, now + lease_seconds, task_id))
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return Task(task_id, run_id, kind, json.loads(payload), attempts + 1, token)
+
+    def complete(self, task, worker_id, result, new_tasks=()):
+        """Record a task's result and enqueue its follow-up tasks atomically.
+
+        Returns False if another worker already completed this task (its lease expired
+        and the task was handed out again); the first result wins, later ones are dropped.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO results (task_id, run_id, kind, result, worker, completed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (task.task_id, task.run_id, task.kind, json.dumps(result), worker_id, now))
+            if cursor.rowcount == 0:
+                self.conn.execute("COMMIT")
+                return False
+            self.conn.execute(
+                "UPDATE tasks SET status = 'done', lease_token = NULL WHERE task_id = ?", (task.task_id,))
+            for kind, payload, key in new_tasks:
+                self._insert_task(task.run_id, kind, payload, make_task_id(task.run_id, kind, key), now)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def fail(self, task, error, retry_delay=30, count_attempt=True):
+        """Give a leased task back for a later retry, or mark it dead after max_attempts.
+
+        With count_attempt=False the task is only deferred (e.g. its host's circuit is open)
+        and the lease does not use up one of its attempts.
+        """
+        attempts = task.attempts if count_attempt else task.attempts - 1
+        status = "dead" if attempts >= self.max_attempts else "pending"
+        self.conn.execute(
+            "UPDATE tasks SET status = ?, attempts = ?, available_at = ?, lease_token = NULL, last_error = ? "
+            "WHERE task_id = ? AND lease_token = ?",
+            (status, attempts, time.time() + retry_delay, str(error)[:500], task.task_id, task.lease_token))
+
+    def stats(self, run_id=None):
+        """Count tasks by status"""
+        query = "SELECT status, COUNT(*) FROM tasks"
+        params = ()
+        if run_id:
+            query += " WHERE run_id = ?"
+            params = (run_id,)
+        counts = {"pending": 0, "leased": 0, "done": 0, "dead": 0}
+        counts.update(dict(self.conn.execute(query + " GROUP BY status", params).fetchall()))
+        return counts
+
+    def results(self, run_id, kind=None):
+        """Yield the result of every completed task in a run"""
+        query = "SELECT result FROM results WHERE run_id = ?"
+        params = [run_id]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        for (result,) in self.conn.execute(query, params):
+            yield json.loads(result)
+
+    def close(self):
+        self.conn.close()
+
+
+# Lua scripts keep each Redis state transition atomic, mirroring the SQLite transactions above.
+# Every key a script touches is passed in KEYS, as Redis Cluster and Redis-compatible servers require.
+REDIS_ENQUEUE = """
+if redis.call('EXISTS', KEYS[2]) == 1 then return 0 end
+redis.call('HSET', KEYS[2], 'run_id', ARGV[2], 'kind', ARGV[3], 'payload', ARGV[4], 'attempts', 0, 'status', 'pending')
+redis.call('ZADD', KEYS[1], ARGV[5], ARGV[1])
+return 1
+"""
+
+REDIS_REQUEUE_EXPIRED = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, task_id in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], task_id)
+    redis.call('ZADD', KEYS[1], ARGV[1], task_id)
+end
+return #expired
+"""
+
+REDIS_LEASE = """
+local score = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not score or tonumber(score) > tonumber(ARGV[2]) then return 0 end
+redis.call('ZREM', KEYS[1], ARGV[1])
+local attempts = tonumber(redis.call('HGET', KEYS[4], 'attempts'))
+if attempts >= tonumber(ARGV[6]) then
+    redis.call('HSET', KEYS[4], 'status', 'dead', 'last_error', 'lease expired')
+    redis.call('SADD', KEYS[3], ARGV[1])
+    return 0
+end
+attempts = redis.call('HINCRBY', KEYS[4], 'attempts', 1)
+redis.call('HSET', KEYS[4], 'status', 'leased', 'lease_owner', ARGV[4], 'lease_token', ARGV[5])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+return {redis.call('HGET', KEYS[4], 'run_id'), redis.call('HGET', KEYS[4], 'kind'),
+        redis.call('HGET', KEYS[4], 'payload'), attempts}
+"""
+
+REDIS_COMPLETE = """
+if redis.call('HSETNX', KEYS[1], ARGV[1], ARGV[2]) == 0 then return 0 end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[1])
+redis.call('HSET', KEYS[4], 'status', 'done', 'lease_token', '')
+for i, child in ipairs(cjson.decode(ARGV[4])) do
+    local task_key = KEYS[4 + i]
+    if redis.call('EXISTS', task_key) == 0 then
+        redis.call('HSET', task_key, 'run_id', ARGV[5], 'kind', child[2], 'payload', child[3], 'attempts', 0, 'status', 'pending')
+        redis.call('ZADD', KEYS[3], ARGV[3], child[1])
+    end
+end
+return 1
+"""
+
+REDIS_FAIL = """
+if redis.call('HGET', KEYS[4], 'lease_token') ~= ARGV[2] then return 0 end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HSET', KEYS[4], 'lease_token', '', 'last_error', ARGV[4])
+if ARGV[6] == '0' then redis.call('HINCRBY', KEYS[4], 'attempts', -1) end
+if tonumber(redis.call('HGET', KEYS[4], 'attempts')) >= tonumber(ARGV[5]) then
+    redis.call('HSET', KEYS[4], 'status', 'dead')
+    redis.call('SADD', KEYS[3], ARGV[1])
+else
+    redis.call('HSET', KEYS[4], 'status', 'pending')
+    redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+end
+return 1
+"""
+
+
+class RedisWorkQueue:
+    """Same queue semantics on any Redis-compatible server, for workers spread over several nodes"""
+
+    def __init__(self, redis_url="redis://localhost:6379/0", max_attempts=3, prefix="{climate_news:queue}:"):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("The redis package is required for redis:// queues; install it with 'pip install redis'")
+        self.client = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.max_attempts = max_attempts
+        self.prefix = prefix
+        self.ready_key = f"{prefix}ready"
+        self.leased_key = f"{prefix}leased"
+        self.dead_key = f"{prefix}dead"
+        self._enqueue = self.client.register_script(REDIS_ENQUEUE)
+        self._requeue_expired = self.client.register_script(REDIS_REQUEUE_EXPIRED)
+        self._lease = self.client.register_script(REDIS_LEASE)
+        self._complete = self.client.register_script(REDIS_COMPLETE)
+        self._fail = self.client.register_script(REDIS_FAIL)
+
+    def _results_key(self, run_id):
+        return f"{self.prefix}results:{run_id}"
+
+    def _task_key(self, task_id):
+        return f"{self.prefix}task:{task_id}"
+
+    def enqueue(self, run_id, kind, payload, key):
+        task_id = make_task_id(run_id, kind, key)
+        added = self._enqueue(keys=[self.ready_key, self._task_key(task_id)],
+                              args=[task_id, run_id, kind, json.dumps(payload), time.time()])
+        if added:
+            self.client.sadd(f"{self.prefix}runs:{run_id}", task_id)
+        return bool(added)
+
+    def lease(self, worker_id, lease_seconds=120):
+        now = time.time()
+        token = uuid.uuid4().hex
+        self._requeue_expired(keys=[self.ready_key, self.leased_key], args=[now])
+        while True:
+            # The script needs the task's key up front, so pick a candidate first; it returns 0 if
+            # another worker leased the task in between, or if the task had no attempts left
+            ready = self.client.zrangebyscore(self.ready_key, "-inf", now, start=0, num=1)
+            if not ready:
+                return None
+            task_id = ready[0]
+            row = self._lease(keys=[self.ready_key, self.leased_key, self.dead_key, self._task_key(task_id)],
+                              args=[task_id, now, now + lease_seconds, worker_id, token, self.max_attempts])
+            if row:
+                run_id, kind, payload, attempts = row
+                return Task(task_id, run_id, kind, json.loads(payload), int(attempts), token)
+
+    def complete(self, task, worker_id, result, new_tasks=()):
+        children = [[make_task_id(task.run_id, kind, key), kind, json.dumps(payload)]
+                    for kind, payload, key in new_tasks]
+        stored = json.dumps({"kind": task.kind, "worker": worker_id, "result": result})
+        keys = [self._results_key(task.run_id), self.leased_key, self.ready_key, self._task_key(task.task_id)]
+        done = self._complete(keys=keys + [self._task_key(child[0]) for child in children],
+                              args=[task.task_id, stored, time.time(), json.dumps(children), task.run_id])
+        if done and children:
+            self.client.sadd(f"{self.prefix}runs:{task.run_id}", *[child[0] for child in children])
+        return bool(done)
+
+    def fail(self, task, error, retry_delay=30, count_attempt=True):
+        self._fail(keys=[self.leased_key, self.ready_key, self.dead_key, self._task_key(task.task_id)],
+                   args=[task.task_id, task.lease_token, time.time() + retry_delay,
+                         str(error)[:500], self.max_attempts, "1" if count_attempt else "0"])
+
+    def stats(self, run_id=None):
+        counts = {"pending": 0, "leased": 0, "done": 0, "dead": 0}
+        if run_id:
+            task_ids = self.client.smembers(f"{self.prefix}runs:{run_id}")
+            pipe = self.client.pipeline()
+            for task_id in task_ids:
+                pipe.hget(self._task_key(task_id), "status")
+            for status in pipe.execute():
+                if status in counts:
+                    counts[status] += 1
+            return counts
+        counts["pending"] = self.client.zcard(self.ready_key)
+        counts["leased"] = self.client.zcard(self.leased_key)
+        counts["dead"] = self.client.scard(self.dead_key)
+        return counts
+
+    def results(self, run_id, kind=None):
+        for stored in self.client.hvals(self._results_key(run_id)):
+            stored = json.loads(stored)
+            if kind is None or stored["kind"] == kind:
+                yield stored["result"]
+
+    def close(self):
+        self.client.close()